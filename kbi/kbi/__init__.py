@@ -2,4 +2,11 @@ from .kedro_magic import *
 from .pipeline_interactive_builder import *
 from .catalog_manager import *
 from .parameter_manager import *
-from .pipeline_manager import *
\ No newline at end of file
+from .pipeline_manager import *
+from .pipeline_graph import *
+from .pipeline_exporter import *
+from .node_fusion import *
+from .run_hooks import *
+from .lineage_index import *
+from .parameter_sweep import *
+from .memory_budget import *
\ No newline at end of file
@@ -93,9 +93,23 @@ class CatalogManager:
         Apply the changes to the catelog file.
         """
 
+        with open(self.kedro_project_dir / 'conf' / 'base' / 'catalog.yml', 'w') as f:
+            f.write(self.render_catalog())
+
+    def render_catalog(self, catalog_names: list[str] | None = None) -> str:
+        """
+        Render the catalog as the contents of a Kedro catalog.yml file.
+
+        Args:
+            - catalog_names: the catalog entries to render, defaults to all of them
+        """
+
         catalog_list = []
 
         for catalog_name, catalog in self.catalog_content.items():
+            if catalog_names is not None and catalog_name not in catalog_names:
+                continue
+
             catalog_type = catalog['catalog_type']
             catalog_content = copy.deepcopy(catalog['catalog_content'])
 
@@ -113,10 +127,7 @@ class CatalogManager:
         path = Path(__file__).parent / 'templates'
         env = Environment(loader=FileSystemLoader(str(path)))
         template = env.get_template('project_catalog.pytemplate')
-        result = template.render(catalog=catalog_list)
-
-        with open(self.kedro_project_dir / 'conf' / 'base' / 'catalog.yml', 'w') as f:
-            f.write(result)
+        return template.render(catalog=catalog_list)
 
 
 
@@ -7,6 +7,8 @@ import argparse
 import re
 import ast
 from .pipeline_interactive_builder import PipelineInteractiveBuilder
+from .pipeline_graph import PipelineGraph
+from .lineage_index import LineageIndex
 # from pydantic import BaseModel
 
 @magics_class
@@ -31,10 +33,15 @@ class KedroMagic(Magics):
         parser.add_argument('-pp', '--project-path', required=True)
         parser.add_argument('-pn', '--pipeline-name', required=True)
         parser.add_argument('-v', '--verbose', action='store_true')
+        parser.add_argument('-f', '--fuse', action='store_true')
+        parser.add_argument('-m', '--memory-limit-mb', type=int, required=False)
         args = parser.parse_args(shlex.split(line))
 
+        memory_limit = args.memory_limit_mb * 2**20 if args.memory_limit_mb is not None else None
+
         self.verbose = args.verbose
-        self.kbi_builder = PipelineInteractiveBuilder(args.pipeline_name, args.project_path, args.verbose)
+        self.kbi_builder = PipelineInteractiveBuilder(
+            args.pipeline_name, args.project_path, args.verbose, args.fuse, memory_limit)
         self.shell.push({'kbi_builder': self.kbi_builder})
         self.vprint('Initializing KBI context')
 
@@ -46,16 +53,98 @@ class KedroMagic(Magics):
         # The format of the 
         self.kbi_builder.update_imports(cell)
     
+    @line_magic
+    def kbi_export(self, line):
+        """
+        Export the pipeline as a frozen, versioned package for batch runs.
+        """
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-f', '--fuse', action='store_true')
+        parser.add_argument('-o', '--output-dir', required=False)
+        args = parser.parse_args(shlex.split(line))
+
+        package_dir = self.kbi_builder.export_pipeline(args.fuse, args.output_dir)
+        print(f'Exported pipeline to {package_dir}')
+        print(f'Run it with `python -m {package_dir.name}` from the Kedro project directory, '
+              f'with {package_dir.parent} on the PYTHONPATH')
+
+    @line_magic
+    def kbi_lineage(self, line):
+        """
+        Query the run history and dataset lineage of the pipeline.
+        """
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-r', '--runs', type=int, default=10)
+        parser.add_argument('-s', '--stale', nargs='?', const='', required=False)
+        parser.add_argument('-p', '--produced-by', required=False)
+        args = parser.parse_args(shlex.split(line))
+
+        lineage_index = self.kbi_builder.lineage_index
+
+        if args.produced_by is not None:
+            produced = lineage_index.produced_by(args.produced_by)
+            if produced is None:
+                print(f'{args.produced_by} has not been produced by any recorded run')
+            else:
+                dataset_name, filepath, version, node_name, node_hash, run_id, created_at = produced
+                print(f'{dataset_name} ({filepath or "in memory"}) was produced by node {node_name} '
+                      f'(hash {node_hash[:12]}) in run {run_id} at {created_at}'
+                      + (f', as version {version}' if version else ''))
+        elif args.stale is not None:
+            stale = lineage_index.stale_nodes(args.stale or None)
+            print('Stale nodes: ' + (', '.join(stale) if stale else 'none'))
+        else:
+            for run_id, started_at, duration, status, peak_memory, peak_memory_after_spill, nodes_run \
+                    in lineage_index.recent_runs(args.runs):
+                print(f'run {run_id}: {started_at} {status} in {duration:.3f}s, {nodes_run} nodes, '
+                      f'peak memory of intermediates {(peak_memory or 0) / 2**20:.1f}MB, '
+                      f'{(peak_memory_after_spill or 0) / 2**20:.1f}MB after spilling')
+
     @line_magic
     def print_pipeline(self, line):
-        """Prints the pipeline"""
+        """
+        Prints the pipeline DAG with the timings of the last run of each node.
+
+        Nodes on the critical path are marked with *, and nodes that nothing else can
+        run in parallel with are marked with !.
+        """
         parser = argparse.ArgumentParser()
         parser.add_argument('-pipeline', required=False)
 
         args = parser.parse_args(shlex.split(line))
 
         if not args.pipeline:
-            pass
+            args.pipeline = self.kbi_builder.pipeline_name
+
+        db_connection = self.kbi_builder.db_connection
+        graph = PipelineGraph(args.pipeline, db_connection)
+        if not graph.nodes:
+            print(f'Pipeline {args.pipeline} has no nodes')
+            return
+
+        last_node_runs = LineageIndex(args.pipeline, db_connection).last_node_runs()
+        timings = {node_name: last_run[2] for node_name, last_run in last_node_runs.items()}
+        levels = graph.levels()
+        critical_path = graph.critical_path(timings)
+        on_critical_path = set(critical_path)
+        blockers = set(graph.parallelism_blockers())
+
+        critical_time = sum(timings.get(node_name, 0.0) for node_name in critical_path)
+        total_time = sum(timings.get(node_name, 0.0) for node_name in graph.nodes)
+        lines = [f'Pipeline {args.pipeline}: {len(graph.nodes)} nodes, {max(levels.values()) + 1} levels, '
+                 f'critical path {critical_time:.3f}s of {total_time:.3f}s of node time']
+
+        for node_name in sorted(graph.topological_order(), key=lambda name: levels[name]):
+            marks = ('*' if node_name in on_critical_path else ' ') + ('!' if node_name in blockers else ' ')
+            timing = f'{timings[node_name]:.3f}s' if node_name in timings else 'not run'
+            tags = PipelineGraph.json_list(graph.nodes[node_name][4])
+            lines.append(f'{marks} [{levels[node_name]}] {node_name} ({timing})' + (f' tags: {", ".join(tags)}' if tags else ''))
+            lines.append(f'        in:  {", ".join(graph.node_inputs[node_name]) or "-"}')
+            lines.append(f'        out: {", ".join(graph.node_outputs[node_name]) or "-"}')
+
+        lines.append('Critical path: ' + ' -> '.join(critical_path))
+        lines.append('* on the critical path, ! blocks parallelism, [n] level of the node')
+        print('\n'.join(lines))
 
 def load_ipython_extension(ipython):
     """
@@ -0,0 +1,329 @@
+import sqlite3
+import json
+import hashlib
+import datetime
+from pathlib import PurePosixPath
+from .pipeline_graph import PipelineGraph
+
+class LineageIndex:
+    """
+    Manages the run history and dataset lineage for a interactive pipeline.
+    """
+
+    def __init__( self
+                , pipeline_name: str
+                , db_connection: sqlite3.Connection):
+        """
+        Constructor for LineageIndex class.
+
+        Records which version of each node (by hash) produced which version of each
+        dataset, so questions about staleness and provenance can be answered from the
+        KBI database without looking at the filesystem.
+
+        Args:
+            - pipeline_name: the name of the pipeline
+            - db_connection: the connection to the KBI database.
+        """
+
+        self.pipeline_name = pipeline_name
+        self.db_connection = db_connection
+
+        cursor = db_connection.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                pipeline_name TEXT,
+                started_at TEXT,
+                duration REAL,
+                status TEXT,
+                peak_memory INTEGER,
+                peak_memory_after_spill INTEGER,
+                FOREIGN KEY(pipeline_name) REFERENCES pipeline(pipeline_name)
+            );
+        ''')
+
+        # One row per node that ran successfully in a run
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS node_runs (
+                run_id INTEGER,
+                pipeline_name TEXT,
+                node_name TEXT,
+                node_hash TEXT,
+                started_at TEXT,
+                duration REAL,
+                FOREIGN KEY(run_id) REFERENCES runs(run_id)
+            );
+        ''')
+
+        # One row per dataset written by a node, filepath is where the version was
+        # written and version is the save version of versioned catalog entries
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dataset_versions (
+                run_id INTEGER,
+                dataset_name TEXT,
+                filepath TEXT,
+                version TEXT,
+                node_name TEXT,
+                node_hash TEXT,
+                created_at TEXT,
+                FOREIGN KEY(run_id) REFERENCES runs(run_id)
+            );
+        ''')
+
+        # Databases created before the save version and the peak after spilling were recorded
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(dataset_versions);').fetchall()]
+        if 'version' not in columns:
+            cursor.execute('ALTER TABLE dataset_versions ADD COLUMN version TEXT;')
+        columns = [row[1] for row in cursor.execute('PRAGMA table_info(runs);').fetchall()]
+        if 'peak_memory_after_spill' not in columns:
+            cursor.execute('ALTER TABLE runs ADD COLUMN peak_memory_after_spill INTEGER;')
+
+        # The version of every parameter and catalog entry at the time of each run
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS config_versions (
+                run_id INTEGER,
+                name TEXT,
+                config_hash TEXT,
+                FOREIGN KEY(run_id) REFERENCES runs(run_id)
+            );
+        ''')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS node_runs_node ON node_runs(pipeline_name, node_name, started_at);')
+        cursor.execute('CREATE INDEX IF NOT EXISTS dataset_versions_dataset ON dataset_versions(dataset_name, created_at);')
+        cursor.execute('CREATE INDEX IF NOT EXISTS dataset_versions_filepath ON dataset_versions(filepath);')
+        cursor.execute('CREATE INDEX IF NOT EXISTS config_versions_run ON config_versions(run_id);')
+
+        self.db_connection.commit()
+
+    def record_run( self
+                  , started_at: datetime.datetime
+                  , duration: float
+                  , status: str
+                  , node_timings: dict[str, float]
+                  , node_started_at: dict[str, str]
+                  , peak_memory: int | None = None
+                  , peak_memory_after_spill: int | None = None
+                  , saved_at: dict[str, str] | None = None
+                  , save_version: str | None = None) -> int:
+        """
+        Record a run of the pipeline along with the nodes that ran, the datasets they
+        wrote and the version of the parameters and catalog entries they ran with.
+
+        Args:
+            - started_at: when the run started
+            - duration: how long the run took, in seconds
+            - status: 'success' or 'failed'
+            - node_timings: node_name -> how long the node took, for the nodes that completed
+            - node_started_at: node_name -> when the node started, as an ISO timestamp
+            - peak_memory: the peak size of the intermediates held in memory, before any were spilled, in bytes
+            - peak_memory_after_spill: the peak size of the intermediates left in memory after spilling, in bytes
+            - saved_at: dataset_name -> when it was saved, as an ISO timestamp, for the
+              datasets saved to the catalog during the run
+            - save_version: the version the versioned catalog entries were saved as
+
+        Returns the id of the run.
+        """
+
+        graph = PipelineGraph(self.pipeline_name, self.db_connection)
+        cursor = self.db_connection.cursor()
+
+        result = cursor.execute("SELECT catalog_name, catalog_content FROM catalog;")
+        catalog_entries = {row[0]: json.loads(row[1]) for row in result.fetchall()}
+        saved_at = saved_at or {}
+
+        cursor.execute(
+            "INSERT INTO runs(pipeline_name, started_at, duration, status, peak_memory, peak_memory_after_spill) "
+            "VALUES(?, ?, ?, ?, ?, ?);",
+            (self.pipeline_name, started_at.isoformat(), duration, status, peak_memory, peak_memory_after_spill)
+        )
+        run_id = cursor.lastrowid
+
+        cursor.executemany(
+            "INSERT INTO config_versions(run_id, name, config_hash) VALUES(?, ?, ?);",
+            [(run_id, name, config_hash) for name, config_hash in self.config_versions().items()]
+        )
+
+        for node_name, node_duration in node_timings.items():
+            if node_name not in graph.nodes:
+                continue
+
+            node_hash = graph.node_hash(node_name)
+            # A node without a start time is taken to have started with the run
+            node_started = node_started_at.get(node_name, started_at.isoformat())
+            cursor.execute(
+                "INSERT INTO node_runs(run_id, pipeline_name, node_name, node_hash, started_at, duration) "
+                "VALUES(?, ?, ?, ?, ?, ?);",
+                (run_id, self.pipeline_name, node_name, node_hash, node_started, node_duration)
+            )
+
+            created_at = datetime.datetime.fromisoformat(node_started) + datetime.timedelta(seconds=node_duration)
+            for dataset in graph.node_outputs[node_name]:
+                entry = catalog_entries.get(dataset)
+                filepath = version = None
+                if entry is not None:
+                    # A catalog entry only has a new version once it has been saved
+                    if dataset not in saved_at:
+                        continue
+                    filepath = entry.get('filepath')
+                    if entry.get('versioned') and filepath is not None and save_version is not None:
+                        # Kedro saves versions as <filepath>/<version>/<file name>
+                        version = save_version
+                        filepath = str(PurePosixPath(filepath) / version / PurePosixPath(filepath).name)
+
+                cursor.execute(
+                    "INSERT INTO dataset_versions(run_id, dataset_name, filepath, version, node_name, node_hash, created_at) "
+                    "VALUES(?, ?, ?, ?, ?, ?, ?);",
+                    (run_id, dataset, filepath, version, node_name, node_hash, saved_at.get(dataset, created_at.isoformat()))
+                )
+
+        self.db_connection.commit()
+
+        return run_id
+
+    def config_versions(self) -> dict[str, str]:
+        """
+        Get a hash of the current value of each parameter and catalog entry.
+
+        Returns dataset name -> hash, for every params:<name> dataset of the pipeline,
+        the parameters dataset holding all of them, and every catalog entry.
+        """
+        def digest(value):
+            return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+        cursor = self.db_connection.cursor()
+        result = cursor.execute(
+            "SELECT parameter_name, parameter_content FROM parameters WHERE pipeline_name = ?;",
+            (self.pipeline_name,)
+        )
+        parameters = {row[0]: json.loads(row[1]) for row in result.fetchall()}
+
+        versions = {f'params:{name}': digest(value) for name, value in parameters.items()}
+        versions['parameters'] = digest(parameters)
+
+        result = cursor.execute("SELECT catalog_name, catalog_type, catalog_content FROM catalog;")
+        for catalog_name, catalog_type, catalog_content in result.fetchall():
+            versions[catalog_name] = digest([catalog_type, json.loads(catalog_content)])
+
+        return versions
+
+    def recent_runs(self, limit: int = 10) -> list[tuple]:
+        """
+        Get the most recent runs of the pipeline, newest first.
+
+        Returns (run_id, started_at, duration, status, peak_memory, peak_memory_after_spill, nodes run) rows.
+        """
+        cursor = self.db_connection.cursor()
+        result = cursor.execute(
+            "SELECT runs.run_id, runs.started_at, runs.duration, runs.status, runs.peak_memory, runs.peak_memory_after_spill, "
+            "COUNT(node_runs.node_name) "
+            "FROM runs LEFT JOIN node_runs ON runs.run_id = node_runs.run_id "
+            "WHERE runs.pipeline_name = ? "
+            "GROUP BY runs.run_id ORDER BY runs.run_id DESC LIMIT ?;",
+            (self.pipeline_name, limit)
+        )
+
+        return result.fetchall()
+
+    def last_node_runs(self) -> dict[str, tuple]:
+        """
+        Get the latest run of each node in the pipeline.
+
+        Returns node_name -> (node_hash, started_at, duration, run_id).
+        """
+        cursor = self.db_connection.cursor()
+
+        # SQLite takes the bare columns from the row holding the MAX
+        result = cursor.execute(
+            "SELECT node_name, node_hash, MAX(started_at), duration, run_id FROM node_runs "
+            "WHERE pipeline_name = ? GROUP BY node_name;",
+            (self.pipeline_name,)
+        )
+
+        return {row[0]: row[1:] for row in result.fetchall()}
+
+    def produced_by(self, dataset: str) -> tuple | None:
+        """
+        Get what produced the latest version of a dataset.
+
+        Args:
+            - dataset: the dataset name, the filepath of a catalog entry, or the path a
+              version of it was written to
+
+        Returns (dataset_name, filepath, version, node_name, node_hash, run_id, created_at),
+        or None if the dataset has never been produced.
+        """
+        cursor = self.db_connection.cursor()
+
+        result = cursor.execute("SELECT catalog_name, catalog_content FROM catalog;")
+        dataset_names = [dataset] + [row[0] for row in result.fetchall() if json.loads(row[1]).get('filepath') == dataset]
+
+        placeholders = ', '.join('?' for _ in dataset_names)
+        result = cursor.execute(
+            "SELECT dataset_name, filepath, version, node_name, node_hash, run_id, created_at FROM dataset_versions "
+            f"WHERE dataset_name IN ({placeholders}) OR filepath = ? ORDER BY created_at DESC LIMIT 1;",
+            (*dataset_names, dataset)
+        )
+
+        return result.fetchone()
+
+    def stale_nodes(self, dataset: str | None = None) -> list[str]:
+        """
+        Get the nodes whose outputs are out of date, in topological order.
+
+        A node is stale when it has never run, its code or signature has changed since it
+        last ran, one of its inputs has a version newer than its last run, a parameter or
+        catalog entry it uses has changed since its last run, or a node it depends on is
+        stale. Every other node can be skipped.
+
+        Args:
+            - dataset: only consider the nodes downstream of this dataset, which can be a
+              params:<name> dataset
+        """
+        graph = PipelineGraph(self.pipeline_name, self.db_connection)
+        last_node_runs = self.last_node_runs()
+        config_versions = self.config_versions()
+
+        cursor = self.db_connection.cursor()
+        result = cursor.execute("SELECT dataset_name, MAX(created_at) FROM dataset_versions GROUP BY dataset_name;")
+        latest_versions = dict(result.fetchall())
+
+        result = cursor.execute(
+            "SELECT config_versions.run_id, config_versions.name, config_versions.config_hash "
+            "FROM config_versions JOIN runs ON config_versions.run_id = runs.run_id WHERE runs.pipeline_name = ?;",
+            (self.pipeline_name,)
+        )
+        # (run_id, name) -> the hash of the parameter or catalog entry in that run
+        recorded_config_versions = {(row[0], row[1]): row[2] for row in result.fetchall()}
+
+        def config_changed(node_name, run_id):
+            return any(recorded_config_versions.get((run_id, name)) != config_versions[name]
+                       for name in graph.node_inputs[node_name] + graph.node_outputs[node_name]
+                       if name in config_versions)
+
+        candidates = None
+        if dataset is not None:
+            candidates = set()
+            pending = list(graph.consumers.get(dataset, []))
+            if dataset.startswith('params:'):
+                pending.extend(graph.consumers.get('parameters', []))
+            while pending:
+                node_name = pending.pop()
+                if node_name not in candidates:
+                    candidates.add(node_name)
+                    pending.extend(graph.downstream_nodes(node_name))
+
+        stale = []
+        stale_set = set()
+        # Every node is checked, since a node is stale when one upstream of the dataset is
+        for node_name in graph.topological_order():
+            last_run = last_node_runs.get(node_name)
+            if last_run is None or last_run[0] != graph.node_hash(node_name) \
+                    or any(upstream in stale_set for upstream in graph.upstream_nodes(node_name)) \
+                    or any(latest_versions.get(dataset_name, '') > last_run[1] for dataset_name in graph.node_inputs[node_name]) \
+                    or config_changed(node_name, last_run[3]):
+                stale_set.add(node_name)
+                if candidates is None or node_name in candidates:
+                    stale.append(node_name)
+
+        return stale
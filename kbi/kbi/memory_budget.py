@@ -0,0 +1,168 @@
+import pathlib
+import pickle
+import sys
+from collections import Counter
+from typing import Any
+from kedro.io import MemoryDataset
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate how many bytes a value holds in memory.
+
+    Uses the reported size of numpy arrays and pandas objects, and walks the
+    contents of builtin containers.
+    """
+    seen = set()
+
+    def size_of(value):
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+
+        if hasattr(value, 'memory_usage') and callable(value.memory_usage):
+            usage = value.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        if hasattr(value, 'nbytes'):
+            return int(value.nbytes)
+
+        size = sys.getsizeof(value)
+        if isinstance(value, dict):
+            size += sum(size_of(key) + size_of(item) for key, item in value.items())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(size_of(item) for item in value)
+
+        return size
+
+    return size_of(value)
+
+class SpillableMemoryDataset(MemoryDataset):
+    """
+    A MemoryDataset whose data can be moved out of memory to a pickle file.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._filepath = None
+
+    def spill(self, filepath: pathlib.Path) -> None:
+        """
+        Move the data to a pickle file, or save it there directly if it has not been saved yet.
+
+        The data held is pickled as is, without the copy MemoryDataset makes on load.
+        """
+        self._filepath = pathlib.Path(filepath)
+        if super()._exists():
+            self._dump(self._data)
+            super()._release()
+
+    def _dump(self, data: Any) -> None:
+        with open(self._filepath, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self) -> Any:
+        if self._filepath is None:
+            return super().load()
+
+        with open(self._filepath, 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, data: Any) -> None:
+        if self._filepath is None:
+            super().save(data)
+        else:
+            self._dump(data)
+
+    def _exists(self) -> bool:
+        return self._filepath is not None or super()._exists()
+
+    def _release(self) -> None:
+        if self._filepath is not None:
+            self._filepath.unlink(missing_ok=True)
+            self._filepath = None
+        super()._release()
+
+    def _describe(self) -> dict[str, Any]:
+        if self._filepath is not None:
+            return {"filepath": str(self._filepath)}
+        return super()._describe()
+
+class MemoryBudgetHooks:
+    """
+    Run hooks tracking the intermediates held in memory during a run, and spilling
+    them to disk when they go over a memory limit.
+    """
+
+    def __init__(self, memory_limit: int | None, spill_dir: pathlib.Path):
+        """
+        Constructor for MemoryBudgetHooks class.
+
+        The runner already releases a MemoryDataset once its last consumer has run;
+        these hooks follow the same load counts to know which intermediates are still
+        alive. Whenever a node leaves more than memory_limit bytes of them alive, the
+        largest are moved to pickle files in spill_dir until the rest fit. The outputs
+        of the run are never spilled, since the runner returns them from memory.
+
+        peak_memory is the most bytes of intermediates held while a node ran, counting
+        its inputs and outputs before anything was spilled, so it can go over
+        memory_limit. peak_memory_after_spill is the most bytes left in memory once
+        spilling was done.
+
+        Args:
+            - memory_limit: the most bytes of intermediates to keep in memory, or None for no limit
+            - spill_dir: the directory to spill intermediates to
+        """
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.peak_memory = 0
+        self.peak_memory_after_spill = 0
+        self.spilled = []
+        self._live = {}
+        self._spilled_sizes = {}
+        self._load_counts = Counter()
+        self._in_memory = set()
+        self._run_outputs = set()
+        self._spillable = {}
+
+    def before_pipeline_run(self, pipeline: Pipeline, catalog: Any):
+        self._load_counts = Counter(dataset for node in pipeline.nodes for dataset in node.inputs)
+        self._in_memory = {dataset for dataset in pipeline.all_outputs() if dataset not in catalog}
+        self._run_outputs = pipeline.outputs()
+
+        # Registered before the runner adds a MemoryDataset for the unregistered
+        # intermediates, the outputs of the run are left for the runner to return
+        if self.memory_limit is not None:
+            self._spillable = {dataset: SpillableMemoryDataset() for dataset in self._in_memory - self._run_outputs}
+            for dataset, spillable in self._spillable.items():
+                catalog.add(dataset, spillable)
+
+    def after_node_run(self, node: Node, outputs: dict[str, Any]):
+        # The outputs are saved to the catalog right after this hook, and were held in
+        # memory along with the inputs of the node, spilled ones included
+        for dataset, value in outputs.items():
+            if dataset in self._in_memory:
+                self._live[dataset] = estimate_size(value)
+        loaded_from_spill = sum(self._spilled_sizes.get(dataset, 0) for dataset in set(node.inputs))
+        self.peak_memory = max(self.peak_memory, sum(self._live.values()) + loaded_from_spill)
+
+        for dataset in node.inputs:
+            self._load_counts[dataset] -= 1
+            if self._load_counts[dataset] < 1:
+                self._live.pop(dataset, None)
+                self._spilled_sizes.pop(dataset, None)
+
+        if self.memory_limit is not None:
+            for dataset in sorted(self._live, key=self._live.get, reverse=True):
+                if sum(self._live.values()) <= self.memory_limit:
+                    break
+                if dataset not in self._spillable:
+                    continue
+
+                # Outputs of this node are written straight to the file when the runner saves them
+                self._spillable[dataset].spill(self.spill_dir / f'{len(self.spilled)}.pkl')
+
+                self._spilled_sizes[dataset] = self._live.pop(dataset)
+                self.spilled.append(dataset)
+
+        self.peak_memory_after_spill = max(self.peak_memory_after_spill, sum(self._live.values()))
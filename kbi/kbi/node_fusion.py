@@ -0,0 +1,83 @@
+"""
+Fuses a linear chain of Kedro nodes into a single node.
+
+This module only depends on Kedro so that it can be copied as-is into exported
+pipeline packages.
+"""
+
+import logging
+import time
+from collections import Counter
+from kedro.pipeline.node import Node, node
+
+logger = logging.getLogger(__name__)
+
+def fuse_nodes(name: str, nodes: list[Node]) -> Node:
+    """
+    Build a single Kedro node that runs a chain of nodes back to back.
+
+    The intermediates passed between the nodes of the chain are kept in a local
+    dictionary, so they are never saved to or loaded from the catalog, and each one is
+    dropped once the last node of the chain needing it has run. The run time
+    of each node in the chain is kept on the fused function's timings attribute, and
+    the nodes of the chain on its nodes attribute.
+
+    Args:
+        - name: the name of the fused node
+        - nodes: the nodes to fuse, in execution order
+    """
+
+    produced = set()
+    inputs = []
+    for chained in nodes:
+        for dataset in chained.inputs:
+            if dataset not in produced and dataset not in inputs:
+                inputs.append(dataset)
+        produced.update(chained.outputs)
+
+    consumed = Counter(dataset for chained in nodes for dataset in chained.inputs)
+    outputs = [dataset for chained in nodes for dataset in chained.outputs if dataset not in consumed]
+
+    def fused(*args):
+        data = dict(zip(inputs, args))
+        remaining_loads = consumed.copy()
+        fused.timings = {}
+        for chained in nodes:
+            start = time.perf_counter()
+            data.update(chained.run({dataset: data[dataset] for dataset in chained.inputs}))
+            fused.timings[chained.name] = time.perf_counter() - start
+            logger.info("Fused node %s ran %s in %.3fs", name, chained.name, fused.timings[chained.name])
+
+            # Drop each intermediate as soon as the last node needing it has run
+            for dataset in chained.inputs:
+                remaining_loads[dataset] -= 1
+                if remaining_loads[dataset] == 0:
+                    data.pop(dataset, None)
+
+        return [data[dataset] for dataset in outputs]
+
+    fused.__name__ = name
+    # The run time of each node in the chain, from the last time the fused node ran
+    fused.timings = {}
+    fused.nodes = list(nodes)
+
+    tags = set()
+    for chained in nodes:
+        tags.update(chained.tags)
+
+    return node(
+        func=fused,
+        inputs=inputs or None,
+        outputs=outputs or None,
+        name=name,
+        tags=sorted(tags) or None
+    )
+
+def expand_fused_nodes(nodes: list[Node]) -> list[Node]:
+    """
+    Replace every fused node in a list of nodes by the nodes it was fused from.
+
+    Args:
+        - nodes: the nodes, some of which may have been built by fuse_nodes
+    """
+    return [chained for fused in nodes for chained in getattr(fused.func, 'nodes', [fused])]
@@ -92,6 +92,14 @@ class ParameterManager:
         Apply the parameters to the Kedro project.
         """
 
+        with open(self.kedro_project_dir / 'conf' / 'base' / f'parameters_{self.pipeline_name}.yml', 'w') as f:
+            f.write(self.render_parameters())
+
+    def render_parameters(self) -> str:
+        """
+        Render the parameters as the contents of a Kedro parameters file.
+        """
+
         parameter_list = []
 
         for parameter_name, parameter_content in self.parameters.items():
@@ -102,5 +110,4 @@ class ParameterManager:
         template = env.get_template('project_parameters.pytemplate')
         result = template.render(parameters=parameter_list)
 
-        with open(self.kedro_project_dir / 'conf' / 'base' / f'parameters_{self.pipeline_name}.yml', 'w') as f:
-            f.write(result.replace('\n\n', '\n').strip())
+        return result.replace('\n\n', '\n').strip()
@@ -0,0 +1,208 @@
+import itertools
+import sys
+from collections import Counter
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from kedro.framework.project import pipelines
+from kedro.framework.session import KedroSession
+from kedro.framework.startup import bootstrap_project
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from .node_fusion import expand_fused_nodes
+from .parameter_manager import ParameterManager
+
+# The swept nodes, catalog, parameters and shared data of the sweep run by a worker process
+_worker_state = {}
+
+def load_project(project_dir_path: pathlib.Path, pipeline_name: str) -> tuple:
+    """
+    Load the pipeline, catalog and parameters of the Kedro project as they are on disk.
+
+    The modules of the project package are imported again, so nodes changed since
+    they were last imported in this process are picked up. Fused nodes are expanded
+    back into the nodes they were fused from.
+
+    Args:
+        - project_dir_path: the path to the Kedro project directory
+        - pipeline_name: the name of the pipeline
+    """
+    metadata = bootstrap_project(pathlib.Path(project_dir_path))
+    for module_name in list(sys.modules):
+        if module_name == metadata.package_name or module_name.startswith(metadata.package_name + '.'):
+            del sys.modules[module_name]
+
+    with KedroSession.create(project_path=project_dir_path, save_on_close=False) as session:
+        context = session.load_context()
+
+    return Pipeline(expand_fused_nodes(pipelines[pipeline_name].nodes)), context.catalog, context.params
+
+def run_nodes( nodes: list[Node]
+             , catalog: Any
+             , data: dict[str, Any]
+             , keep: set[str]) -> dict[str, Any]:
+    """
+    Run nodes in order, keeping their outputs in memory.
+
+    Inputs are taken from data when present and loaded from the catalog otherwise.
+    Nothing is saved to the catalog, and every dataset not in keep is dropped from
+    data once the last node needing it has run.
+
+    Args:
+        - nodes: the nodes to run, in topological order
+        - catalog: the catalog to load the free inputs from
+        - data: dataset name -> value, updated with the outputs of the nodes
+        - keep: the datasets to keep in data after the run
+    """
+    remaining_loads = Counter(dataset for node in nodes for dataset in node.inputs)
+
+    for node in nodes:
+        inputs = {dataset: data[dataset] if dataset in data else catalog.load(dataset) for dataset in node.inputs}
+        data.update(node.run(inputs))
+
+        for dataset in node.inputs:
+            remaining_loads[dataset] -= 1
+            if remaining_loads[dataset] == 0 and dataset not in keep:
+                data.pop(dataset, None)
+
+    return data
+
+def parameter_feed(params: dict[str, Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    """
+    Get the parameter datasets for a set of parameter overrides.
+    """
+    params = {**params, **overrides}
+    feed = {f'params:{name}': value for name, value in params.items()}
+    feed['parameters'] = params
+
+    return feed
+
+def split_sweep(pipeline: Pipeline, grid: dict[str, list[Any]]) -> tuple[Pipeline, Pipeline]:
+    """
+    Split a pipeline into the nodes shared by every point of a grid and the nodes to sweep.
+
+    The swept nodes are the ones depending on a parameter of the grid, directly or
+    through another node, and every other node is shared.
+
+    Args:
+        - pipeline: the pipeline, without fused nodes
+        - grid: parameter name -> the values to sweep it over
+
+    Returns the shared and the swept pipelines.
+    """
+    swept_datasets = [f'params:{name}' for name in grid] + ['parameters']
+    swept_datasets = [dataset for dataset in swept_datasets if dataset in pipeline.all_inputs()]
+    if not swept_datasets:
+        raise ValueError(f"No node in the pipeline depends on {list(grid)}")
+
+    swept = pipeline.from_inputs(*swept_datasets)
+    shared = Pipeline([node for node in pipeline.nodes if node not in swept.nodes])
+
+    return shared, swept
+
+def _init_worker( project_dir_path: pathlib.Path
+                , pipeline_name: str
+                , node_names: list[str]
+                , shared: dict[str, Any]):
+    """
+    Load the project and keep the outputs of the shared nodes, once per worker process.
+    """
+    pipeline, catalog, params = load_project(project_dir_path, pipeline_name)
+    _worker_state.update(nodes=pipeline.only_nodes(*node_names).nodes, catalog=catalog, params=params, shared=shared)
+
+def _run_sweep_point(overrides: dict[str, Any], outputs: list[str]) -> dict[str, Any]:
+    """
+    Run the swept nodes for one point of the grid, in a worker process.
+    """
+    data = {**_worker_state['shared'], **parameter_feed(_worker_state['params'], overrides)}
+    run_nodes(_worker_state['nodes'], _worker_state['catalog'], data, set(outputs))
+
+    return {dataset: data[dataset] for dataset in outputs}
+
+class ParameterSweep:
+    """
+    Runs a interactive pipeline over a grid of parameter values.
+    """
+
+    def vprint(self, str, **args):
+        if self.verbose:
+            print(str, **args)
+
+    def __init__( self
+                , pipeline_name: str
+                , project_dir_path: pathlib.Path
+                , param_manager: ParameterManager
+                , verbose: bool = False):
+        """
+        Constructor for ParameterSweep class.
+
+        Args:
+            - pipeline_name: the name of the pipeline
+            - project_dir_path: the path to the Kedro project directory
+            - param_manager: the manager of the parameters being swept
+        """
+
+        self.pipeline_name = pipeline_name
+        self.project_dir_path = project_dir_path
+        self.param_manager = param_manager
+        self.verbose = verbose
+
+    def run( self
+           , grid: dict[str, list[Any]]
+           , outputs: list[str] | None = None
+           , max_workers: int | None = None):
+        """
+        Run the pipeline for every combination of the parameter values in grid.
+
+        The nodes that do not depend on a swept parameter are run once, in this
+        process. Their outputs are then sent once to each worker of a process pool
+        that runs the nodes that do depend on one, once per point of the grid, so the
+        swept nodes must not modify their inputs in place. The project is loaded
+        again on every call, the parameters in the Kedro project are left untouched
+        and nothing is saved to the catalog.
+
+        Args:
+            - grid: parameter name -> the values to sweep it over
+            - outputs: the datasets to collect, defaults to the outputs of the swept
+              nodes that no other node consumes
+            - max_workers: the size of the process pool, defaults to the number of CPUs
+
+        Returns one row per point of the grid, holding its parameter values and the
+        collected outputs, as a pandas DataFrame when pandas is installed and as a
+        list of dicts otherwise.
+        """
+
+        unknown = [name for name in grid if name not in self.param_manager.parameters]
+        if unknown:
+            raise ValueError(f"Cannot sweep parameters that are not defined: {unknown}")
+
+        pipeline, catalog, params = load_project(self.project_dir_path, self.pipeline_name)
+        shared, swept = split_sweep(pipeline, grid)
+
+        if outputs is None:
+            outputs = sorted(swept.outputs())
+
+        # Only the outputs of the shared nodes that the swept nodes need are sent to the workers
+        self.vprint(f"Running {len(shared.nodes)} shared nodes once")
+        shared_datasets = swept.all_inputs() & shared.all_outputs()
+        shared_data = run_nodes(shared.nodes, catalog, parameter_feed(params, {}), shared_datasets)
+        shared_data = {dataset: shared_data[dataset] for dataset in shared_datasets}
+
+        points = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+        node_names = [node.name for node in swept.nodes]
+        self.vprint(f"Running {len(node_names)} swept nodes for {len(points)} parameter combinations")
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(self.project_dir_path, self.pipeline_name, node_names, shared_data)
+        ) as executor:
+            futures = [executor.submit(_run_sweep_point, point, outputs) for point in points]
+            rows = [{**point, **future.result()} for point, future in zip(points, futures)]
+
+        try:
+            import pandas as pd
+        except ImportError:
+            return rows
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,169 @@
+import compileall
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import py_compile
+import re
+import shutil
+import kedro
+from jinja2 import Environment, FileSystemLoader
+from .catalog_manager import CatalogManager
+from .parameter_manager import ParameterManager
+from .pipeline_graph import PipelineGraph
+from .pipeline_manager import PipelineManager
+
+class PipelineExporter:
+    """
+    Exports a interactive pipeline as a frozen package for batch runs.
+    """
+
+    def vprint(self, str, **args):
+        if self.verbose:
+            print(str, **args)
+
+    def __init__( self
+                , pipeline_manager: PipelineManager
+                , cat_manager: CatalogManager
+                , param_manager: ParameterManager
+                , export_dir: pathlib.Path
+                , verbose: bool = False):
+        """
+        Constructor for PipelineExporter class.
+
+        Args:
+            - pipeline_manager: the manager of the pipeline to export
+            - cat_manager: the manager of the catalog the pipeline uses
+            - param_manager: the manager of the parameters the pipeline uses
+            - export_dir: the directory to write the exports to
+        """
+
+        self.pipeline_manager = pipeline_manager
+        self.cat_manager = cat_manager
+        self.param_manager = param_manager
+        self.export_dir = export_dir
+        self.verbose = verbose
+
+    def export(self, fuse: bool = False) -> pathlib.Path:
+        """
+        Export the pipeline as a frozen, versioned package.
+
+        The package holds the nodes in a precomputed topological order, the catalog and
+        parameters as they are now, a manifest pinning them, and precompiled bytecode.
+        Run it with `python -m <package>` from the Kedro project directory.
+
+        Args:
+            - fuse: run linear chains of in-memory intermediates as single nodes
+
+        Returns the path of the exported package.
+        """
+
+        pipeline_name = self.pipeline_manager.pipeline_name
+        graph = PipelineGraph(pipeline_name, self.pipeline_manager.db_connection)
+        order = graph.topological_order()
+        nodes_list = [graph.nodes[node_name] for node_name in order]
+
+        cursor = self.pipeline_manager.db_connection.cursor()
+        result = cursor.execute(
+            "SELECT pipeline_imports FROM pipelines WHERE pipeline_name = ?;",
+            (pipeline_name,)
+        )
+        imports = result.fetchone()[0]
+
+        # Only the datasets the pipeline touches are exported
+        datasets = set(graph.producers) | set(graph.consumers)
+        catalog_names = [name for name in self.cat_manager.catalog_content if name in datasets]
+        catalog = self.cat_manager.render_catalog(catalog_names)
+        parameters = self.param_manager.render_parameters()
+
+        fused_chains = graph.fusible_chains(catalog_names) if fuse else []
+
+        # The version changes whenever anything that ends up in the package does
+        digest = hashlib.sha256()
+        for part in [imports or '', json.dumps(nodes_list), catalog, parameters, json.dumps(fused_chains)]:
+            digest.update(part.encode('utf-8'))
+        created_at = datetime.datetime.now()
+        version = f"{created_at:%Y%m%dT%H%M%S}-{digest.hexdigest()[:8]}"
+
+        package_name = re.sub(r'\W', '_', f'{pipeline_name}_frozen')
+        package_dir = self.export_dir / pipeline_name / version / package_name
+        # Exporting the same pipeline twice in the same second gives the same version
+        (package_dir / 'conf').mkdir(parents=True, exist_ok=True)
+        self.vprint(f"Exporting pipeline {pipeline_name} to {package_dir}")
+
+        self.pipeline_manager.render_nodes_file(package_dir / 'nodes.py', imports, nodes_list)
+        self.pipeline_manager.render_pipeline_file(
+            package_dir / 'pipeline.py', nodes_list, fused_chains, fusion_module='.fusion')
+        if fused_chains:
+            shutil.copy(pathlib.Path(__file__).parent / 'node_fusion.py', package_dir / 'fusion.py')
+
+        with open(package_dir / 'conf' / 'catalog.yml', 'w') as f:
+            f.write(catalog)
+        with open(package_dir / 'conf' / 'parameters.yml', 'w') as f:
+            f.write(parameters)
+
+        path = pathlib.Path(__file__).parent / 'templates'
+        env = Environment(loader=FileSystemLoader(path))
+        template = env.get_template('export_main.pytemplate')
+        with open(package_dir / '__main__.py', 'w') as f:
+            f.write(template.render(pipeline_name=pipeline_name, version=version, package_name=package_name))
+        (package_dir / '__init__.py').touch()
+
+        chain_by_head = {chain[0]: chain for chain in fused_chains}
+        fused_nodes = {node_name for chain in fused_chains for node_name in chain}
+        run_order = []
+        for node_name in order:
+            if node_name in chain_by_head:
+                run_order.append(PipelineGraph.fused_node_name(chain_by_head[node_name]))
+            elif node_name not in fused_nodes:
+                run_order.append(node_name)
+
+        manifest = {
+            "pipeline_name": pipeline_name,
+            "version": version,
+            "created_at": created_at.isoformat(),
+            "kedro_version": kedro.__version__,
+            "topological_order": order,
+            "run_order": run_order,
+            "fused_chains": fused_chains,
+            "node_hashes": {node_name: graph.node_hash(node_name) for node_name in order},
+            "catalog_sha256": hashlib.sha256(catalog.encode('utf-8')).hexdigest(),
+            "parameters_sha256": hashlib.sha256(parameters.encode('utf-8')).hexdigest(),
+            "load_versions": self.pinned_load_versions(
+                [name for name in graph.free_inputs() if name in catalog_names]),
+        }
+        with open(package_dir / 'manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=4)
+
+        # The export is never edited, so the bytecode does not need to be checked against the source
+        compileall.compile_dir(
+            package_dir,
+            quiet=1,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+
+        return package_dir
+
+    def pinned_load_versions(self, catalog_names: list[str]) -> dict[str, str]:
+        """
+        Pin each versioned dataset to its latest version on disk.
+
+        Only the free inputs of the pipeline should be pinned. A dataset the pipeline
+        writes must be loaded at the version the same run saved.
+
+        Args:
+            - catalog_names: the catalog entries to pin
+        """
+
+        load_versions = {}
+        for catalog_name in catalog_names:
+            catalog_content = self.cat_manager.catalog_content[catalog_name]['catalog_content']
+            if not catalog_content.get('versioned') or 'filepath' not in catalog_content:
+                continue
+
+            # Kedro stores each version as a directory named by its timestamp
+            versions_dir = self.cat_manager.kedro_project_dir / catalog_content['filepath']
+            if versions_dir.is_dir() and os.listdir(versions_dir):
+                load_versions[catalog_name] = sorted(os.listdir(versions_dir))[-1]
+
+        return load_versions
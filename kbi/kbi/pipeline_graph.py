@@ -0,0 +1,283 @@
+import sqlite3
+import json
+import hashlib
+
+class PipelineGraph:
+    """
+    A read-only DAG view of the nodes table for a interactive pipeline.
+    """
+
+    def __init__( self
+                , pipeline_name: str
+                , db_connection: sqlite3.Connection):
+        """
+        Constructor for PipelineGraph class.
+
+        Loads the nodes of the pipeline from the KBI database and indexes which node
+        produces and which nodes consume each dataset.
+
+        Args:
+            - pipeline_name: the name of the pipeline
+            - db_connection: the connection to the KBI database.
+        """
+
+        self.pipeline_name = pipeline_name
+
+        cursor = db_connection.cursor()
+        result = cursor.execute(
+            "SELECT * FROM nodes WHERE pipeline_name = ?;",
+            (pipeline_name,)
+        )
+
+        # node_name -> the raw row from the nodes table, in insertion order
+        self.nodes = {row[0]: row for row in result.fetchall()}
+        self.node_inputs = {}
+        self.node_outputs = {}
+        self.producers = {}
+        self.consumers = {}
+        self._topological_order = None
+
+        for node_name, node in self.nodes.items():
+            self.node_inputs[node_name] = self.dataset_names(node[2])
+            self.node_outputs[node_name] = self.dataset_names(node[3])
+
+            for dataset in self.node_outputs[node_name]:
+                self.producers[dataset] = node_name
+            for dataset in self.node_inputs[node_name]:
+                self.consumers.setdefault(dataset, []).append(node_name)
+
+    @staticmethod
+    def dataset_names(serialized: str | None) -> list[str]:
+        """
+        Get the dataset names out of a serialized inputs/outputs column.
+
+        Args:
+            - serialized: the JSON inputs or outputs of a node, as stored in the nodes table
+        """
+        if serialized is None:
+            return []
+
+        value = json.loads(serialized)
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        if isinstance(value, dict):
+            return list(value.values())
+
+        return list(value)
+
+    @staticmethod
+    def json_list(serialized: str | None) -> list[str]:
+        """
+        Get a list out of a serialized column holding a string, a list or nothing, like the tags column.
+
+        Args:
+            - serialized: the JSON column, as stored in the nodes table
+        """
+        if serialized is None:
+            return []
+
+        value = json.loads(serialized)
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+
+        return list(value)
+
+    def node_hash(self, node_name: str) -> str:
+        """
+        Get a hash identifying the current version of a node (its code and its signature).
+
+        Args:
+            - node_name: the name of the node
+        """
+        node = self.nodes[node_name]
+        digest = hashlib.sha256(json.dumps(node[:7]).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def upstream_nodes(self, node_name: str) -> list[str]:
+        """
+        Get the nodes that directly produce the inputs of a node.
+        """
+        upstream = []
+        for dataset in self.node_inputs[node_name]:
+            producer = self.producers.get(dataset)
+            if producer is not None and producer not in upstream:
+                upstream.append(producer)
+
+        return upstream
+
+    def downstream_nodes(self, node_name: str) -> list[str]:
+        """
+        Get the nodes that directly consume the outputs of a node.
+        """
+        downstream = []
+        for dataset in self.node_outputs[node_name]:
+            for consumer in self.consumers.get(dataset, []):
+                if consumer not in downstream:
+                    downstream.append(consumer)
+
+        return downstream
+
+    def free_inputs(self) -> list[str]:
+        """
+        Get the datasets that the pipeline consumes but does not produce.
+        """
+        return [dataset for dataset in self.consumers if dataset not in self.producers]
+
+    def topological_order(self) -> list[str]:
+        """
+        Get the node names in an order in which they can be executed.
+
+        Ties are broken by the order the nodes were added to the pipeline, so the
+        result is stable between calls.
+        """
+        if self._topological_order is not None:
+            return list(self._topological_order)
+
+        remaining = {name: len(self.upstream_nodes(name)) for name in self.nodes}
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+
+        while ready:
+            node_name = ready.pop(0)
+            order.append(node_name)
+
+            for downstream in self.downstream_nodes(node_name):
+                remaining[downstream] -= 1
+                if remaining[downstream] == 0:
+                    ready.append(downstream)
+
+        if len(order) != len(self.nodes):
+            cyclic = [name for name in self.nodes if name not in order]
+            raise RuntimeError(f"Pipeline {self.pipeline_name} has a cycle between nodes {cyclic}")
+
+        self._topological_order = order
+        return list(order)
+
+    def fusible_chains( self
+                      , registered_datasets: set[str] | list[str] = ()
+                      , cut_after: str | None = None) -> list[list[str]]:
+        """
+        Find the linear chains of nodes whose intermediates never need to be persisted.
+
+        Node A is chained into node B when every output of A is consumed by B and
+        nothing else, none of those outputs is registered in the catalog, and A is the
+        only node B depends on. Nodes with a namespace or confirms are never chained.
+
+        Args:
+            - registered_datasets: the dataset names registered in the catalog
+            - cut_after: a node that must end its chain, so it can be run up to on its own
+        """
+        registered_datasets = set(registered_datasets)
+
+        def fusible(node_name):
+            node = self.nodes[node_name]
+            return node[5] is None and node[6] is None
+
+        # node_name -> the node it can be fused into
+        next_in_chain = {}
+        for node_name in self.nodes:
+            outputs = self.node_outputs[node_name]
+            if not outputs or not fusible(node_name) or node_name == cut_after:
+                continue
+            if any(dataset in registered_datasets for dataset in outputs):
+                continue
+
+            consumers = {consumer for dataset in outputs for consumer in self.consumers.get(dataset, [])}
+            if any(len(self.consumers.get(dataset, [])) != 1 for dataset in outputs) or len(consumers) != 1:
+                continue
+
+            consumer = consumers.pop()
+            if fusible(consumer) and self.upstream_nodes(consumer) == [node_name]:
+                next_in_chain[node_name] = consumer
+
+        chain_members = set(next_in_chain.values())
+        chains = []
+        for node_name in self.topological_order():
+            if node_name not in next_in_chain or node_name in chain_members:
+                continue
+
+            chain = [node_name]
+            while chain[-1] in next_in_chain:
+                chain.append(next_in_chain[chain[-1]])
+            chains.append(chain)
+
+        return chains
+
+    @staticmethod
+    def fused_node_name(chain: list[str]) -> str:
+        """
+        Get the name of the node that a fused chain runs as.
+        """
+        return 'fused__' + '__'.join(chain)
+
+    def levels(self) -> dict[str, int]:
+        """
+        Get the depth of each node, nodes of the same depth can run in parallel.
+        """
+        levels = {}
+        for node_name in self.topological_order():
+            levels[node_name] = max((levels[upstream] + 1 for upstream in self.upstream_nodes(node_name)), default=0)
+
+        return levels
+
+    def critical_path(self, weights: dict[str, float]) -> list[str]:
+        """
+        Get the path through the pipeline with the largest total weight.
+
+        Args:
+            - weights: node_name -> the cost of the node, e.g. its last run time. Nodes
+              without a weight cost nothing, and every node costs 1 when none have one.
+        """
+        if not any(weights.get(node_name) for node_name in self.nodes):
+            weights = {node_name: 1.0 for node_name in self.nodes}
+
+        # node_name -> (cost of the heaviest path ending at the node, previous node on it)
+        heaviest = {}
+        for node_name in self.topological_order():
+            previous = max(self.upstream_nodes(node_name), key=lambda upstream: heaviest[upstream][0], default=None)
+            cost = weights.get(node_name) or 0.0
+            if previous is not None:
+                cost += heaviest[previous][0]
+            heaviest[node_name] = (cost, previous)
+
+        # The last heaviest node is taken, so nodes costing nothing still end the path
+        path = []
+        node_name = max(reversed(heaviest), key=lambda name: heaviest[name][0], default=None)
+        while node_name is not None:
+            path.append(node_name)
+            node_name = heaviest[node_name][1]
+
+        return path[::-1]
+
+    def parallelism_blockers(self) -> list[str]:
+        """
+        Get the nodes that nothing else can run in parallel with, in topological order.
+
+        These are the nodes every other node is either upstream or downstream of.
+        """
+        order = self.topological_order()
+        if len(order) < 2:
+            return []
+
+        # Sets of nodes are kept as bitmasks, indexed by topological position
+        bits = {node_name: 1 << i for i, node_name in enumerate(order)}
+        ancestors = {}
+        for node_name in order:
+            ancestors[node_name] = 0
+            for upstream in self.upstream_nodes(node_name):
+                ancestors[node_name] |= ancestors[upstream] | bits[upstream]
+
+        descendants = {}
+        for node_name in reversed(order):
+            descendants[node_name] = 0
+            for downstream in self.downstream_nodes(node_name):
+                descendants[node_name] |= descendants[downstream] | bits[downstream]
+
+        everything = (1 << len(order)) - 1
+        return [node_name for node_name in order
+                if ancestors[node_name] | descendants[node_name] | bits[node_name] == everything]
@@ -7,6 +7,9 @@ from functools import wraps
 from .catalog_manager import CatalogManager
 from .parameter_manager import ParameterManager
 from .pipeline_manager import PipelineManager
+from .pipeline_exporter import PipelineExporter
+from .lineage_index import LineageIndex
+from .parameter_sweep import ParameterSweep
 from threading import Lock
 import inspect
 
@@ -22,13 +25,22 @@ class PipelineInteractiveBuilder:
         if self.verbose:
             print(str, **args)
 
-    def __init__(self, pipeline_name: str, project_path: str, verbose: bool = False):
+    def __init__( self
+                , pipeline_name: str
+                , project_path: str
+                , verbose: bool = False
+                , fuse: bool = False
+                , memory_limit: int | None = None):
         """
         Constructor for PipelineInteractiveBuilder class.
 
         Steps:
             1. Create DB file and hook. If the DB file already exists, not much to do. Otherwise,
             2. Create the skeleton of the Kedro project (if it doesn't already exist)
+
+        When fuse is set, linear chains of in-memory intermediates are run as single nodes.
+        When memory_limit is set, intermediates over that many bytes are spilled to disk
+        during runs.
         """
 
         self._kbi_dir = pathlib.Path(project_path) / 'kbi_data'
@@ -51,7 +63,8 @@ class PipelineInteractiveBuilder:
         self.cat_manager = CatalogManager(self.db_connection, self._kedro_project_dir / 'kbi-project')
         self.param_manager = ParameterManager(self.pipeline_name, self.db_connection, self._kedro_project_dir / 'kbi-project')
         self.pipeline_path = self._kedro_project_dir / 'kbi-project' / 'src' / 'kbi_project' / 'pipelines' / self.pipeline_name
-        self.pipeline_manager = PipelineManager(self.pipeline_name, self.pipeline_path, self._kedro_project_dir / 'kbi-project', self.db_connection, self.verbose)
+        self.lineage_index = LineageIndex(self.pipeline_name, self.db_connection)
+        self.pipeline_manager = PipelineManager(self.pipeline_name, self.pipeline_path, self._kedro_project_dir / 'kbi-project', self.db_connection, self.verbose, fuse, self.lineage_index, memory_limit)
 
         # Create the Kedro project if it doesn't exist
         self.create_kedro_project()
@@ -102,6 +115,35 @@ class PipelineInteractiveBuilder:
         """
         self.param_manager.delete_parameter(parameter_name)
 
+    def sweep_parameters( self
+                        , grid: dict[str, list[Any]]
+                        , outputs: list[str] | None = None
+                        , max_workers: int | None = None):
+        """
+        Run the pipeline over every combination of the parameter values in grid.
+
+        Args:
+            - grid: parameter name -> the values to sweep it over
+            - outputs: the datasets to collect for each combination
+            - max_workers: the size of the process pool
+        """
+        sweep = ParameterSweep(self.pipeline_name, self._kedro_project_dir / 'kbi-project', self.param_manager, self.verbose)
+
+        return sweep.run(grid, outputs, max_workers)
+
+    def export_pipeline(self, fuse: bool = False, export_dir: str | None = None) -> pathlib.Path:
+        """
+        Export the pipeline as a frozen, versioned package for batch runs.
+
+        Args:
+            - fuse: run linear chains of in-memory intermediates as single nodes
+            - export_dir: the directory to export to, defaults to kbi_data/exports
+        """
+        export_dir = pathlib.Path(export_dir) if export_dir is not None else self._kbi_dir / 'exports'
+        exporter = PipelineExporter(self.pipeline_manager, self.cat_manager, self.param_manager, export_dir, self.verbose)
+
+        return exporter.export(fuse)
+
     def create_kedro_project(self):
         """
         Create the Kedro project if it doesn't already exist.
@@ -136,6 +178,13 @@ class PipelineInteractiveBuilder:
             if resp.returncode != 0:
                 raise Exception(f"Error creating pipeline: {resp.stderr}")
 
+        # Register the KBI hooks, which collect timings, lineage and memory use during runs
+        settings_path = self._kedro_project_dir / 'kbi-project' / 'src' / 'kbi_project' / 'settings.py'
+        settings = settings_path.read_text()
+        if 'KBIHooks' not in settings:
+            with open(settings_path, 'a') as f:
+                f.write('\nfrom kbi.run_hooks import KBIHooks\nHOOKS = (KBIHooks(),)\n')
+
     def kbi_node(
         self,
         inputs: str | list[str] | dict[str, str] | None = None,
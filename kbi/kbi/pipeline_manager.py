@@ -4,9 +4,16 @@ import pathlib
 import re
 import json
 import os
+import time
+import datetime
+import tempfile
 from kedro.framework.session import KedroSession
 from kedro.framework.startup import bootstrap_project
 from pathlib import Path
+from .pipeline_graph import PipelineGraph
+from .run_hooks import DatasetSaveHooks, NodeTimingHooks, active_run_hooks
+from .lineage_index import LineageIndex
+from .memory_budget import MemoryBudgetHooks
 
 os.environ["KEDRO_DISABLE_TELEMETRY"] = "true"
 class PipelineManager:
@@ -23,7 +30,10 @@ class PipelineManager:
                 , pipeline_path: pathlib.Path
                 , project_dir_path: pathlib.Path
                 , db_connection: sqlite3.Connection
-                , verbose: bool = False):
+                , verbose: bool = False
+                , fuse: bool = False
+                , lineage_index: LineageIndex | None = None
+                , memory_limit: int | None = None):
         """
         Constructor for ParameterManager class.
 
@@ -34,6 +44,9 @@ class PipelineManager:
             - pipeline_name: the name of the pipeline
             - pipeline_path: The path of the generated KBI project data
             - db_connection: the connection to the KBI database.
+            - fuse: run linear chains of in-memory intermediates as single nodes
+            - lineage_index: the index to record each run in
+            - memory_limit: the most bytes of intermediates to keep in memory during a run
         """
 
         self.project_dir_path = project_dir_path
@@ -41,6 +54,13 @@ class PipelineManager:
         self.pipeline_path = pipeline_path
         self.db_connection = db_connection
         self.verbose = verbose
+        self.fuse = fuse
+        self.lineage_index = lineage_index
+        self.fused_chains = []
+        self.memory_limit = memory_limit
+        self.last_run_timings = {}
+        self.last_run_peak_memory = 0
+        self.last_run_peak_memory_after_spill = 0
 
         # Create the pipelines and node table, which this class will manage
         cursor = db_connection.cursor()
@@ -209,23 +229,62 @@ class PipelineManager:
             (self.pipeline_name,)
         )
         nodes_list = result.fetchall()
+
+        self.fused_chains = []
+        if self.fuse:
+            result = cursor.execute("SELECT catalog_name FROM catalog;")
+            registered_datasets = [row[0] for row in result.fetchall()]
+            self.fused_chains = PipelineGraph(self.pipeline_name, self.db_connection).fusible_chains(
+                registered_datasets, cut_after=to_node)
+
+        self.render_nodes_file(self.pipeline_path / 'nodes.py', imports, nodes_list)
+        self.render_pipeline_file(
+            self.pipeline_path / 'pipeline.py', nodes_list, self.fused_chains, fusion_module='kbi.node_fusion')
+        
+        # Trigger execution
+        return self.execute_pipeline(to_node)
+    
+    def render_nodes_file( self
+                         , path: pathlib.Path
+                         , imports: str | None
+                         , nodes_list: list[tuple]):
+        """
+        Write a Kedro nodes file using the Jinja2 templates.
+
+        Args:
+            - path: the path of the nodes file to write
+            - imports: the imports for the pipeline
+            - nodes_list: the rows of the nodes table to write
+        """
         nodes_fun_list = [node[1] for node in nodes_list]
 
-        """ Write the new pipelines file """
-        path = pathlib.Path(__file__).parent / 'templates'
-        env = Environment(loader=FileSystemLoader(path))
+        template_path = pathlib.Path(__file__).parent / 'templates'
+        env = Environment(loader=FileSystemLoader(template_path))
         template = env.get_template('project_pipelines_nodes.pytemplate')
         result = template.render(imports=imports, nodes_fun_list=nodes_fun_list)
 
-        # Write the nodes file
-        with open(self.pipeline_path / 'nodes.py', 'w') as f:
+        with open(path, 'w') as f:
             f.write(result)
-        
-        """ Write the new nodes file """
-        template = env.get_template('project_pipelines_pipeline.pytemplate')
-        nodes_formatted = []
-        for node in nodes_list:
-            out = {
+
+    def render_pipeline_file( self
+                            , path: pathlib.Path
+                            , nodes_list: list[tuple]
+                            , fused_chains: list[list[str]] | None = None
+                            , fusion_module: str | None = None):
+        """
+        Write a Kedro pipeline file using the Jinja2 templates.
+
+        The nodes are written in the order given. Each chain in fused_chains is written
+        as a single node built with fuse_nodes, imported from fusion_module.
+
+        Args:
+            - path: the path of the pipeline file to write
+            - nodes_list: the rows of the nodes table to write
+            - fused_chains: the chains of node names to run as a single node
+            - fusion_module: the module to import fuse_nodes from
+        """
+        def format_node(node):
+            return {
                 "func": node[0],
                 "name": f'"{node[0]}"',
                 "inputs": node[2],
@@ -234,35 +293,97 @@ class PipelineManager:
                 "confirms": node[5],
                 "namespace": node[6],
             }
-            nodes_formatted.append(out)
-        
-        result = template.render(nodes_list=nodes_formatted)
 
-        # Write the pipelines file
-        with open(self.pipeline_path / 'pipeline.py', 'w') as f:
+        nodes_by_name = {node[0]: node for node in nodes_list}
+        chain_by_head = {chain[0]: chain for chain in fused_chains or []}
+        chained = {node_name for chain in fused_chains or [] for node_name in chain}
+
+        nodes_formatted = []
+        for node in nodes_list:
+            if node[0] in chain_by_head:
+                chain = chain_by_head[node[0]]
+                nodes_formatted.append({
+                    "name": f'"{PipelineGraph.fused_node_name(chain)}"',
+                    "fused": [format_node(nodes_by_name[node_name]) for node_name in chain]
+                })
+            elif node[0] not in chained:
+                nodes_formatted.append(format_node(node))
+
+        template_path = pathlib.Path(__file__).parent / 'templates'
+        env = Environment(loader=FileSystemLoader(template_path))
+        template = env.get_template('project_pipelines_pipeline.pytemplate')
+        result = template.render(
+            nodes_list=nodes_formatted,
+            fusion_module=fusion_module if chain_by_head else None)
+
+        with open(path, 'w') as f:
             f.write(result)
-        
-        # Trigger execution
-        return self.execute_pipeline(to_node)
-    
+
     def execute_pipeline(self, to_node=None):
         """
         Executes the Kedro pipeline.
 
+        When to_node has been fused, it is run as the chain ending at to_node. The run time
+        of each node is kept in last_run_timings, and the run is recorded in the lineage index.
+
+        Intermediates over memory_limit are spilled to a temporary directory for the
+        length of the run. The peak size of the intermediates in memory is kept in
+        last_run_peak_memory, and the peak once spilling was done in
+        last_run_peak_memory_after_spill.
+
         TODO: add intelligent execution of the nodes based on pre-cached info,
               not sure how KedroSessions can handle this
         """
         bootstrap_project(Path(self.project_dir_path))
-        
-        with KedroSession.create(
-            project_path=self.project_dir_path,
-            save_on_close=True
-        ) as session:
-            result = session.run(
-                pipeline_name=self.pipeline_name,
-                to_nodes=[to_node] if to_node is not None else None)
-
-            return result
+
+        for chain in self.fused_chains:
+            if to_node == chain[-1]:
+                to_node = PipelineGraph.fused_node_name(chain)
+
+        timing_hooks = NodeTimingHooks()
+        save_hooks = DatasetSaveHooks()
+        started_at = datetime.datetime.now()
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix='kbi-spill-') as spill_dir:
+            memory_hooks = MemoryBudgetHooks(self.memory_limit, pathlib.Path(spill_dir))
+
+            def record_run(status):
+                if self.lineage_index is None:
+                    return
+                # Recording is best effort, so it never hides the result or the error of the run
+                try:
+                    self.lineage_index.record_run(
+                        started_at, time.perf_counter() - start, status, timing_hooks.timings, timing_hooks.started_at,
+                        memory_hooks.peak_memory, memory_hooks.peak_memory_after_spill, save_hooks.saved_at,
+                        save_hooks.save_version)
+                except Exception as e:
+                    print(f"Could not record the run in the lineage index: {e!r}")
+
+            try:
+                with KedroSession.create(
+                    project_path=self.project_dir_path,
+                    save_on_close=True
+                ) as session, active_run_hooks(timing_hooks, save_hooks, memory_hooks):
+                    result = session.run(
+                        pipeline_name=self.pipeline_name,
+                        to_nodes=[to_node] if to_node is not None else None)
+            except BaseException:
+                record_run('failed')
+                raise
+            record_run('success')
+
+        self.last_run_timings = timing_hooks.timings
+        self.last_run_peak_memory = memory_hooks.peak_memory
+        self.last_run_peak_memory_after_spill = memory_hooks.peak_memory_after_spill
+        for node_name, duration in self.last_run_timings.items():
+            self.vprint(f"Node {node_name} ran in {duration:.3f}s")
+        self.vprint(f"Peak memory of intermediates: {self.last_run_peak_memory / 2**20:.1f}MB, "
+                    f"{self.last_run_peak_memory_after_spill / 2**20:.1f}MB after spilling")
+        if memory_hooks.spilled:
+            print(f"Spilled {len(memory_hooks.spilled)} intermediates to disk to stay under the memory limit: "
+                  f"{', '.join(memory_hooks.spilled)}")
+
+        return result
 
 
 
@@ -0,0 +1,117 @@
+import datetime
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+# The hooks of the run in progress, which KBIHooks forwards to
+_run_hooks = []
+
+@contextmanager
+def active_run_hooks(*hooks):
+    """
+    Forward the Kedro hook calls made during the block to the given hooks.
+
+    Each hook only needs to define the hook methods it uses, taking any subset of
+    the arguments of the Kedro hook spec.
+    """
+    _run_hooks[:] = hooks
+    try:
+        yield
+    finally:
+        _run_hooks.clear()
+
+def _forward(hook_name: str, **kwargs):
+    for hook in _run_hooks:
+        method = getattr(hook, hook_name, None)
+        if method is not None:
+            parameters = inspect.signature(method).parameters
+            method(**{name: value for name, value in kwargs.items() if name in parameters})
+
+class KBIHooks:
+    """
+    Kedro hooks registered in the settings.py of the generated Kedro project.
+
+    The project's hooks are fixed when a session is created, so these forward to the
+    hooks of the run in progress, set with active_run_hooks.
+    """
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any], pipeline: Pipeline, catalog: Any):
+        _forward('before_pipeline_run', run_params=run_params, pipeline=pipeline, catalog=catalog)
+
+    @hook_impl
+    def before_node_run(self, node: Node, catalog: Any, inputs: dict[str, Any], is_async: bool, session_id: str):
+        _forward('before_node_run', node=node, catalog=catalog, inputs=inputs, is_async=is_async, session_id=session_id)
+
+    @hook_impl
+    def after_node_run( self
+                      , node: Node
+                      , catalog: Any
+                      , inputs: dict[str, Any]
+                      , outputs: dict[str, Any]
+                      , is_async: bool
+                      , session_id: str):
+        _forward('after_node_run', node=node, catalog=catalog, inputs=inputs, outputs=outputs,
+                 is_async=is_async, session_id=session_id)
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Node):
+        _forward('after_dataset_saved', dataset_name=dataset_name, data=data, node=node)
+
+class NodeTimingHooks:
+    """
+    Run hooks recording when each node of a run started and how long it took.
+    """
+
+    def __init__(self):
+        """
+        Constructor for NodeTimingHooks class.
+
+        Fused nodes are reported as the nodes they were fused from, so the timings
+        are always keyed by the node names in the nodes table.
+        """
+        self.timings = {}
+        self.started_at = {}
+        self._started = {}
+
+    def before_node_run(self, node: Node):
+        self._started[node.name] = (time.perf_counter(), datetime.datetime.now())
+
+    def after_node_run(self, node: Node):
+        start, started_at = self._started.pop(node.name)
+        duration = time.perf_counter() - start
+
+        fused_timings = getattr(node.func, 'timings', None)
+        if not fused_timings:
+            fused_timings = {node.name: duration}
+
+        # The nodes of a fused chain run back to back from the start of the fused node
+        for node_name, node_duration in fused_timings.items():
+            self.timings[node_name] = node_duration
+            self.started_at[node_name] = started_at.isoformat()
+            started_at += datetime.timedelta(seconds=node_duration)
+
+class DatasetSaveHooks:
+    """
+    Run hooks recording the datasets saved during a run and the version they were saved as.
+    """
+
+    def __init__(self):
+        """
+        Constructor for DatasetSaveHooks class.
+
+        Versioned catalog entries are saved under the id of the session running them,
+        so that id is kept as the save_version of the run.
+        """
+        self.save_version = None
+        self.saved_at = {}
+
+    def before_pipeline_run(self, run_params: dict[str, Any]):
+        self.save_version = run_params.get('session_id')
+
+    def after_dataset_saved(self, dataset_name: str):
+        self.saved_at[dataset_name] = datetime.datetime.now().isoformat()
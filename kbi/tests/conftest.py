@@ -0,0 +1,55 @@
+import sqlite3
+import json
+import pytest
+from kbi.catalog_manager import CatalogManager
+from kbi.parameter_manager import ParameterManager
+from kbi.pipeline_manager import PipelineManager
+
+PIPELINE_NAME = 'test_pipeline'
+
+@pytest.fixture
+def db_connection():
+    db_connection = sqlite3.connect(':memory:')
+    yield db_connection
+    db_connection.close()
+
+@pytest.fixture
+def kedro_project_dir(tmp_path):
+    (tmp_path / 'conf' / 'base').mkdir(parents=True)
+    return tmp_path
+
+@pytest.fixture
+def pipeline_manager(db_connection, kedro_project_dir):
+    return PipelineManager(PIPELINE_NAME, kedro_project_dir, kedro_project_dir, db_connection)
+
+@pytest.fixture
+def cat_manager(db_connection, kedro_project_dir):
+    return CatalogManager(db_connection, kedro_project_dir)
+
+@pytest.fixture
+def param_manager(db_connection, kedro_project_dir):
+    return ParameterManager(PIPELINE_NAME, db_connection, kedro_project_dir)
+
+@pytest.fixture
+def add_node(pipeline_manager):
+    """
+    Add a node to the nodes table without running it, returning a function that takes
+    the node name, inputs and outputs as they are passed to evaluate_node.
+    """
+
+    def add( node_name: str
+           , inputs: str | list[str] | None = None
+           , outputs: str | list[str] | None = None
+           , node_content: str | None = None
+           , confirms: str | None = None
+           , namespace: str | None = None):
+        args = ', '.join(f'arg{i}' for i in range(len([inputs] if isinstance(inputs, str) else inputs or [])))
+        node_content = node_content or f'def {node_name}({args}):\n    return None\n'
+        pipeline_manager.db_connection.execute(
+            "INSERT INTO nodes(node_name, node_content, inputs, outputs, tags, confirms, namespace, pipeline_name) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?);",
+            (node_name, node_content, json.dumps(inputs), json.dumps(outputs), None, confirms, namespace, PIPELINE_NAME)
+        )
+        pipeline_manager.db_connection.commit()
+
+    return add
@@ -0,0 +1,84 @@
+import datetime
+import pytest
+from kbi.lineage_index import LineageIndex
+from .conftest import PIPELINE_NAME
+
+@pytest.fixture
+def lineage_index(pipeline_manager, cat_manager, param_manager, add_node):
+    """
+    a -> b -> c, where b uses params:scale.
+    """
+    add_node('a', None, 'a_out')
+    add_node('b', ['a_out', 'params:scale'], 'b_out')
+    add_node('c', 'b_out', 'c_out')
+    param_manager.update_parameters('scale', 2)
+
+    return LineageIndex(PIPELINE_NAME, pipeline_manager.db_connection)
+
+def record_run(lineage_index, node_names, started_at, **kwargs):
+    """
+    Record a successful run of the nodes, each taking a second.
+    """
+    node_started_at = {
+        node_name: (started_at + datetime.timedelta(seconds=i)).isoformat() for i, node_name in enumerate(node_names)
+    }
+    return lineage_index.record_run(
+        started_at, len(node_names), 'success', {node_name: 1.0 for node_name in node_names}, node_started_at, **kwargs)
+
+def test_stale_nodes(lineage_index, pipeline_manager):
+    assert lineage_index.stale_nodes() == ['a', 'b', 'c']
+
+    record_run(lineage_index, ['a', 'b', 'c'], datetime.datetime(2025, 1, 1))
+    assert lineage_index.stale_nodes() == []
+
+    # Editing a node makes it and everything downstream of it stale
+    pipeline_manager.db_connection.execute(
+        "UPDATE nodes SET node_content = node_content || '# edited' WHERE node_name = 'b';")
+    assert lineage_index.stale_nodes() == ['b', 'c']
+    assert lineage_index.stale_nodes('b_out') == ['c']
+
+def test_stale_nodes_after_upstream_run(lineage_index):
+    record_run(lineage_index, ['a', 'b', 'c'], datetime.datetime(2025, 1, 1))
+
+    # A new version of a_out is newer than the last runs of b and c
+    record_run(lineage_index, ['a'], datetime.datetime(2025, 1, 2))
+    assert lineage_index.stale_nodes() == ['b', 'c']
+
+def test_stale_nodes_after_parameter_change(lineage_index, param_manager):
+    record_run(lineage_index, ['a', 'b', 'c'], datetime.datetime(2025, 1, 1))
+
+    param_manager.update_parameters('scale', 3)
+    assert lineage_index.stale_nodes() == ['b', 'c']
+    assert lineage_index.stale_nodes('params:scale') == ['b', 'c']
+
+    # Going back to the value of the last run makes them up to date again
+    param_manager.update_parameters('scale', 2)
+    assert lineage_index.stale_nodes() == []
+
+def test_stale_nodes_after_catalog_change(lineage_index, cat_manager):
+    cat_manager.update_catalog('b_out', 'pickle.PickleDataset', {'filepath': 'data/b_out.pkl'})
+    record_run(lineage_index, ['a', 'b', 'c'], datetime.datetime(2025, 1, 1), saved_at={'b_out': '2025-01-01T00:00:02'})
+    assert lineage_index.stale_nodes() == []
+
+    cat_manager.update_catalog('b_out', 'pickle.PickleDataset', {'filepath': 'data/other.pkl'})
+    assert lineage_index.stale_nodes() == ['b', 'c']
+
+def test_produced_by_versioned_dataset(lineage_index, cat_manager):
+    cat_manager.update_catalog('b_out', 'pickle.PickleDataset', {'filepath': 'data/b_out.pkl', 'versioned': True})
+    run_id = record_run(
+        lineage_index, ['a', 'b', 'c'], datetime.datetime(2025, 1, 1),
+        saved_at={'b_out': '2025-01-01T00:00:02'}, save_version='2025-01-01T00.00.00.000Z')
+
+    produced = lineage_index.produced_by('b_out')
+    assert produced[:4] == ('b_out', 'data/b_out.pkl/2025-01-01T00.00.00.000Z/b_out.pkl', '2025-01-01T00.00.00.000Z', 'b')
+    assert produced[5] == run_id
+    assert lineage_index.produced_by('data/b_out.pkl') == produced
+    assert lineage_index.produced_by('data/b_out.pkl/2025-01-01T00.00.00.000Z/b_out.pkl') == produced
+    assert lineage_index.produced_by('a_out')[3] == 'a'
+
+def test_record_run_without_start_times(lineage_index):
+    started_at = datetime.datetime(2025, 1, 1)
+    lineage_index.record_run(started_at, 1.0, 'failed', {'a': 1.0}, {})
+
+    assert lineage_index.last_node_runs()['a'][1] == started_at.isoformat()
+    assert lineage_index.recent_runs(1)[0][3] == 'failed'
@@ -0,0 +1,104 @@
+import pytest
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import node
+from kedro.runner import SequentialRunner
+from kbi.memory_budget import MemoryBudgetHooks, SpillableMemoryDataset, estimate_size
+from kbi.run_hooks import KBIHooks, active_run_hooks
+
+def test_spill_saved_dataset(tmp_path):
+    dataset = SpillableMemoryDataset()
+    dataset.save([1, 2, 3])
+    dataset.spill(tmp_path / 'spilled.pkl')
+
+    assert (tmp_path / 'spilled.pkl').exists()
+    # Nothing is left in memory
+    assert not MemoryDataset._exists(dataset)
+    assert dataset.exists()
+    assert dataset.load() == [1, 2, 3]
+    assert dataset._describe() == {'filepath': str(tmp_path / 'spilled.pkl')}
+
+def test_spill_before_save(tmp_path):
+    dataset = SpillableMemoryDataset()
+    dataset.spill(tmp_path / 'spilled.pkl')
+    assert not (tmp_path / 'spilled.pkl').exists()
+
+    # The data goes straight to the file when it is saved
+    dataset.save({'a': 1})
+    assert (tmp_path / 'spilled.pkl').exists()
+    assert dataset.load() == {'a': 1}
+
+def test_release_deletes_spill_file(tmp_path):
+    dataset = SpillableMemoryDataset()
+    dataset.save('value')
+    dataset.spill(tmp_path / 'spilled.pkl')
+    dataset.release()
+
+    assert not (tmp_path / 'spilled.pkl').exists()
+    assert not dataset.exists()
+
+def make_x():
+    return b'x' * 1000
+
+def make_y(x):
+    return b'y' * 1000
+
+def make_out(x, y):
+    return x + y + b'o' * 3000
+
+def run(memory_limit, spill_dir):
+    """
+    Run x -> y -> out, where out also uses x, with MemoryBudgetHooks.
+    """
+    pipeline = Pipeline([
+        node(make_x, None, 'x', name='make_x'),
+        node(make_y, 'x', 'y', name='make_y'),
+        node(make_out, ['x', 'y'], 'out', name='make_out'),
+    ])
+    catalog = DataCatalog()
+    hooks = MemoryBudgetHooks(memory_limit, spill_dir)
+
+    hook_manager = _create_hook_manager()
+    hook_manager.register(KBIHooks())
+    with active_run_hooks(hooks):
+        # Called by the session before the runner, which adds the default datasets
+        hook_manager.hook.before_pipeline_run(run_params={}, pipeline=pipeline, catalog=catalog)
+        result = SequentialRunner().run(pipeline, catalog, hook_manager)
+
+    return hooks, result
+
+def test_no_limit(tmp_path):
+    hooks, result = run(None, tmp_path)
+
+    assert result['out'] == b'x' * 1000 + b'y' * 1000 + b'o' * 3000
+    assert hooks.spilled == []
+    # x and y were both held when make_y finished, and out with both of them after make_out
+    assert hooks.peak_memory == estimate_size(make_x()) + estimate_size(make_y(None)) + estimate_size(result['out'])
+    assert hooks.peak_memory_after_spill == estimate_size(result['out'])
+
+def test_limit(tmp_path):
+    size = estimate_size(make_x())
+    hooks, result = run(size + 10, tmp_path)
+
+    # x is spilled once y is made, and the run output is never spilled even though it is over the limit
+    assert result['out'] == b'x' * 1000 + b'y' * 1000 + b'o' * 3000
+    assert hooks.spilled == ['x']
+    assert hooks.peak_memory == 2 * size + estimate_size(result['out'])
+    assert hooks.peak_memory_after_spill == estimate_size(result['out'])
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize('memory_limit', [None, 10])
+def test_peak_before_spill(tmp_path, memory_limit):
+    pipeline = Pipeline([
+        node(make_x, None, 'x', name='make_x'),
+        node(make_y, 'x', 'y', name='make_y'),
+    ])
+    catalog = DataCatalog()
+    hooks = MemoryBudgetHooks(memory_limit, tmp_path)
+    hooks.before_pipeline_run(pipeline, catalog)
+    hooks.after_node_run(pipeline.nodes[0], {'x': make_x()})
+
+    # A single intermediate over the limit was still held in memory before it was spilled
+    assert hooks.peak_memory == estimate_size(make_x())
+    assert hooks.peak_memory_after_spill == (0 if memory_limit else estimate_size(make_x()))
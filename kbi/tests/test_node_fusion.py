@@ -0,0 +1,57 @@
+import gc
+import weakref
+from kedro.pipeline.node import node
+from kbi.node_fusion import fuse_nodes
+
+def double(x):
+    return x * 2
+
+def add(x, y):
+    return x + y
+
+def split(x):
+    return x, -x
+
+def test_fuse_nodes():
+    fused = fuse_nodes('fused', [
+        node(double, 'a', 'b', name='double', tags=['first']),
+        node(add, ['b', 'a'], 'c', name='add', tags=['second']),
+        node(split, 'c', ['d', 'e'], name='split'),
+    ])
+
+    # Only the datasets from outside the chain are inputs, and the ones nothing in the chain consumes are outputs
+    assert fused.name == 'fused'
+    assert fused.inputs == ['a']
+    assert fused.outputs == ['d', 'e']
+    assert fused.tags == {'first', 'second'}
+
+    assert fused.run({'a': 3}) == {'d': 9, 'e': -9}
+    assert list(fused.func.timings) == ['double', 'add', 'split']
+
+def test_fuse_nodes_drops_intermediates():
+    class Box:
+        pass
+
+    boxes = []
+
+    def make():
+        box = Box()
+        boxes.append(weakref.ref(box))
+        return box
+
+    def use(box, k):
+        return k
+
+    def dropped(k):
+        gc.collect()
+        return boxes[0]() is None
+
+    fused = fuse_nodes('fused', [
+        node(make, None, 'box', name='make'),
+        node(use, ['box', 'params:k'], 'k', name='use'),
+        node(dropped, 'k', 'dropped', name='dropped'),
+    ])
+
+    # The box is dropped as soon as its only consumer has run
+    assert fused.inputs == ['params:k']
+    assert fused.run({'params:k': 5}) == {'dropped': True}
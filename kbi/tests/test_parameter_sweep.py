@@ -0,0 +1,116 @@
+import types
+import pytest
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import node
+from kbi import parameter_sweep
+from kbi.node_fusion import fuse_nodes
+from kbi.parameter_sweep import ParameterSweep, parameter_feed, run_nodes, split_sweep
+from .conftest import PIPELINE_NAME
+
+def make():
+    return 2
+
+def scale(x, s):
+    return x * s
+
+def increment(x):
+    return x + 1
+
+def other(o):
+    return o
+
+def sweep_nodes():
+    """
+    make -> scale (params:scale) -> increment, and other (params:other) on its own.
+    """
+    return [
+        node(make, None, 'made', name='make'),
+        node(scale, ['made', 'params:scale'], 'scaled', name='scale'),
+        node(increment, 'scaled', 'final', name='increment'),
+        node(other, 'params:other', 'other_out', name='other'),
+    ]
+
+def test_split_sweep():
+    shared, swept = split_sweep(Pipeline(sweep_nodes()), {'scale': [1, 2]})
+
+    assert {node.name for node in shared.nodes} == {'make', 'other'}
+    assert {node.name for node in swept.nodes} == {'scale', 'increment'}
+
+def test_split_sweep_nothing_depends():
+    pipeline = Pipeline([node(make, None, 'made', name='make')])
+
+    with pytest.raises(ValueError):
+        split_sweep(pipeline, {'scale': [1, 2]})
+
+def test_parameter_feed():
+    feed = parameter_feed({'scale': 1, 'other': 'x'}, {'scale': 3})
+
+    assert feed == {
+        'params:scale': 3,
+        'params:other': 'x',
+        'parameters': {'scale': 3, 'other': 'x'},
+    }
+
+def test_run_nodes():
+    nodes = Pipeline(sweep_nodes()).only_nodes('make', 'scale', 'increment').nodes
+    data = run_nodes(nodes, DataCatalog(), parameter_feed({'scale': 5}, {}), {'made', 'final'})
+
+    # scaled and params:scale are dropped once consumed, made is kept
+    assert data['final'] == 11
+    assert data['made'] == 2
+    assert 'scaled' not in data
+    assert 'params:scale' not in data
+
+def test_run_unknown_parameter(param_manager, kedro_project_dir):
+    param_manager.update_parameters('scale', 2)
+    sweep = ParameterSweep(PIPELINE_NAME, kedro_project_dir, param_manager)
+
+    with pytest.raises(ValueError):
+        sweep.run({'nope': [1]})
+
+@pytest.fixture
+def fused_project(monkeypatch, tmp_path):
+    """
+    A project whose pipeline was last generated with fused nodes, where make counts its runs in a file.
+    """
+    runs = tmp_path / 'make_runs'
+    runs.touch()
+
+    def counted_make():
+        with open(runs, 'a') as f:
+            f.write('make\n')
+        return make()
+
+    nodes = sweep_nodes()
+    nodes[0] = node(counted_make, None, 'made', name='make')
+    pipeline = Pipeline([fuse_nodes('fused__make__scale__increment', nodes[:3]), nodes[3]])
+
+    class Session:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def load_context(self):
+            return types.SimpleNamespace(catalog=DataCatalog(), params={'scale': 2, 'other': 'x'})
+
+    monkeypatch.setattr(parameter_sweep, 'bootstrap_project', lambda path: types.SimpleNamespace(package_name='fake_project'))
+    monkeypatch.setattr(parameter_sweep, 'KedroSession', types.SimpleNamespace(create=lambda **kwargs: Session()))
+    monkeypatch.setattr(parameter_sweep, 'pipelines', {PIPELINE_NAME: pipeline})
+
+    return runs
+
+def test_run_fused_project(fused_project, param_manager, kedro_project_dir):
+    param_manager.update_parameters('scale', 2)
+    param_manager.update_parameters('other', 'x')
+    sweep = ParameterSweep(PIPELINE_NAME, kedro_project_dir, param_manager)
+
+    rows = sweep.run({'scale': [1, 2, 3]}, max_workers=2)
+    if not isinstance(rows, list):
+        rows = rows.to_dict('records')
+
+    assert rows == [{'scale': 1, 'final': 3}, {'scale': 2, 'final': 5}, {'scale': 3, 'final': 7}]
+    # make is fused with swept nodes in the project, but is still only run once
+    assert fused_project.read_text() == 'make\n'
@@ -0,0 +1,77 @@
+import importlib.util
+import json
+import pathlib
+import yaml
+import kbi
+from kbi.parameter_manager import ParameterManager
+from kbi.pipeline_exporter import PipelineExporter
+
+def test_export_pins_only_free_inputs(pipeline_manager, cat_manager, param_manager, add_node, kedro_project_dir, tmp_path):
+    add_node('a', 'raw', 'a_out')
+    add_node('b', ['a_out', 'params:scale'], 'b_out')
+    param_manager.update_parameters('scale', 2)
+
+    # Both the free input and the intermediate have versions saved on disk
+    for catalog_name in ['raw', 'a_out']:
+        cat_manager.update_catalog(
+            catalog_name, 'pickle.PickleDataset', {'filepath': f'data/{catalog_name}.pkl', 'versioned': True})
+        for version in ['2025-01-01T00.00.00.000Z', '2025-02-01T00.00.00.000Z']:
+            (kedro_project_dir / 'data' / f'{catalog_name}.pkl' / version).mkdir(parents=True)
+
+    exporter = PipelineExporter(pipeline_manager, cat_manager, param_manager, tmp_path / 'exports')
+    package_dir = exporter.export()
+
+    with open(package_dir / 'manifest.json') as f:
+        manifest = json.load(f)
+
+    # a_out is written by the run itself, so it must be loaded at the version the run saves
+    assert manifest['load_versions'] == {'raw': '2025-02-01T00.00.00.000Z'}
+    assert manifest['run_order'] == ['a', 'b']
+
+def test_export_fused_package(pipeline_manager, cat_manager, param_manager, add_node, db_connection, kedro_project_dir, tmp_path):
+    add_node('a', 'raw', 'a_out')
+    add_node('b', ['a_out', 'params:scale'], 'final')
+    param_manager.update_parameters('scale', 2)
+    ParameterManager('other_pipeline', db_connection, kedro_project_dir).update_parameters('unrelated', 1)
+    cat_manager.update_catalog('raw', 'pickle.PickleDataset', {'filepath': 'data/raw.pkl'})
+    cat_manager.update_catalog('unused', 'pickle.PickleDataset', {'filepath': 'data/unused.pkl'})
+
+    exporter = PipelineExporter(pipeline_manager, cat_manager, param_manager, tmp_path / 'exports')
+    package_dir = exporter.export(fuse=True)
+
+    # Only the catalog entries and parameters of the pipeline are exported
+    catalog = yaml.safe_load((package_dir / 'conf' / 'catalog.yml').read_text())
+    assert catalog == {'raw': {'type': 'pickle.PickleDataset', 'filepath': 'data/raw.pkl'}}
+    parameters = yaml.safe_load((package_dir / 'conf' / 'parameters.yml').read_text())
+    assert parameters == {'scale': 2}
+
+    # a and b are fused, using the copy of the fusion module in the package
+    pipeline = (package_dir / 'pipeline.py').read_text()
+    assert 'from .fusion import fuse_nodes' in pipeline
+    assert 'fuse_nodes("fused__a__b"' in pipeline
+    assert (package_dir / 'fusion.py').read_text() == (pathlib.Path(kbi.__file__).parent / 'node_fusion.py').read_text()
+
+    with open(package_dir / 'manifest.json') as f:
+        manifest = json.load(f)
+    assert manifest['fused_chains'] == [['a', 'b']]
+    assert manifest['run_order'] == ['fused__a__b']
+
+    # The bytecode is written for every module and never checked against the source
+    for module in ['nodes', 'pipeline', 'fusion', '__main__']:
+        pyc = importlib.util.cache_from_source(str(package_dir / f'{module}.py'))
+        with open(pyc, 'rb') as f:
+            header = f.read(8)
+        assert header[:4] == importlib.util.MAGIC_NUMBER
+        assert int.from_bytes(header[4:8], 'little') == 0b01
+
+def test_export_repeated(pipeline_manager, cat_manager, param_manager, add_node, tmp_path):
+    add_node('a', None, 'a_out')
+
+    exporter = PipelineExporter(pipeline_manager, cat_manager, param_manager, tmp_path / 'exports')
+    first = exporter.export(fuse=True)
+    second = exporter.export(fuse=True)
+
+    # Exporting twice in the same second writes over the same version
+    for package_dir in {first, second}:
+        with open(package_dir / 'manifest.json') as f:
+            assert json.load(f)['topological_order'] == ['a']
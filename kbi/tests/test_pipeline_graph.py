@@ -0,0 +1,96 @@
+import pytest
+from kbi.pipeline_graph import PipelineGraph
+from .conftest import PIPELINE_NAME
+
+@pytest.fixture
+def linear_pipeline(add_node):
+    """
+    a -> b -> c -> d, with d added first so the insertion order is not a valid order.
+    """
+    add_node('d', 'c_out', 'final')
+    add_node('a', None, 'a_out')
+    add_node('b', ['a_out', 'params:scale'], 'b_out')
+    add_node('c', 'b_out', 'c_out')
+
+def test_topological_order(pipeline_manager, linear_pipeline):
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.topological_order() == ['a', 'b', 'c', 'd']
+    assert graph.free_inputs() == ['params:scale']
+
+def test_topological_order_breaks_ties_by_insertion(pipeline_manager, add_node):
+    add_node('a', None, 'a_out')
+    add_node('right', 'a_out', 'right_out')
+    add_node('left', 'a_out', 'left_out')
+    add_node('join', ['left_out', 'right_out'], 'final')
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.topological_order() == ['a', 'right', 'left', 'join']
+
+def test_topological_order_cycle(pipeline_manager, add_node):
+    add_node('a', 'b_out', 'a_out')
+    add_node('b', 'a_out', 'b_out')
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    with pytest.raises(RuntimeError):
+        graph.topological_order()
+
+def test_fusible_chains(pipeline_manager, linear_pipeline):
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.fusible_chains() == [['a', 'b', 'c', 'd']]
+    # A registered intermediate has to be saved, so the chain is cut after its producer
+    assert graph.fusible_chains(registered_datasets=['b_out']) == [['a', 'b'], ['c', 'd']]
+    assert graph.fusible_chains(cut_after='c') == [['a', 'b', 'c']]
+    assert graph.fusible_chains(cut_after='a') == [['b', 'c', 'd']]
+
+def test_fusible_chains_branches(pipeline_manager, add_node):
+    add_node('a', None, 'a_out')
+    add_node('left', 'a_out', 'left_out')
+    add_node('right', 'a_out', 'right_out')
+    add_node('join', ['left_out', 'right_out'], 'join_out')
+    add_node('namespaced', 'join_out', 'final', namespace='ns')
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    # a has two consumers, join has two upstream nodes and namespaced nodes are never fused
+    assert graph.fusible_chains() == []
+
+@pytest.fixture
+def diamond_pipeline(add_node):
+    """
+    a -> (left, right) -> join -> d
+    """
+    add_node('a', None, 'a_out')
+    add_node('left', 'a_out', 'left_out')
+    add_node('right', 'a_out', 'right_out')
+    add_node('join', ['left_out', 'right_out'], 'join_out')
+    add_node('d', 'join_out', 'final')
+
+def test_critical_path(pipeline_manager, diamond_pipeline):
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.critical_path({'a': 1.0, 'left': 1.0, 'right': 5.0, 'join': 1.0, 'd': 1.0}) == \
+        ['a', 'right', 'join', 'd']
+    assert graph.critical_path({'left': 3.0, 'right': 1.0}) == ['a', 'left', 'join', 'd']
+    # Without any timings every node costs the same
+    assert len(graph.critical_path({})) == 4
+
+def test_parallelism_blockers(pipeline_manager, diamond_pipeline):
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.levels() == {'a': 0, 'left': 1, 'right': 1, 'join': 2, 'd': 3}
+    assert graph.parallelism_blockers() == ['a', 'join', 'd']
+
+def test_parallelism_blockers_independent_branches(pipeline_manager, add_node):
+    add_node('a', None, 'a_out')
+    add_node('b', 'a_out', 'b_out')
+    add_node('c', None, 'c_out')
+    graph = PipelineGraph(PIPELINE_NAME, pipeline_manager.db_connection)
+
+    assert graph.parallelism_blockers() == []
+
+def test_json_list():
+    assert PipelineGraph.json_list(None) == []
+    assert PipelineGraph.json_list('null') == []
+    assert PipelineGraph.json_list('"tag"') == ['tag']
+    assert PipelineGraph.json_list('["first", "second"]') == ['first', 'second']